@@ -51,7 +51,7 @@ async def main(db_host: str, db_port: int, db_user: str, db_pass: str,
     log.info('Connecting to database \'%s\' at %s as user \'%s\'...',
              db_name, db_host, db_user)
     Database().create_pool(db_host, db_port, db_user,  db_pass, db_name)
-    log.info('Database connection successful')
+    log.info('Database connection pool created')
     # Starting API server
     log.info('Starting uvicorn server...')
 
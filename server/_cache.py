@@ -0,0 +1,141 @@
+"""In-memory cache for serialised endpoint payloads."""
+
+import hashlib
+import time
+import typing
+
+import fastapi
+from starlette.responses import Response
+
+from ._json import RawJSONResponse, dumps
+
+__all__ = [
+    'CachedPayload',
+    'PayloadCache',
+    'STATIC_CACHE_CONTROL',
+    'STATIC_TTL',
+    'cached_fetch',
+    'static_response',
+]
+
+# Lifetime of cached payloads for endpoints whose data only changes with game
+# updates; this keeps the database load low while still picking up changes
+# without a server restart.
+STATIC_TTL = 60 * 60  # 1 hour
+# Cache-Control header for responses of such endpoints, allowing clients and
+# proxies to cache them for the same duration. This is not marked immutable as
+# the URLs are not versioned.
+STATIC_CACHE_CONTROL = f'public, max-age={STATIC_TTL}'
+# Cache-Control header for responses that must be revalidated before reuse
+_NO_CACHE_CONTROL = 'no-cache'
+
+
+class CachedPayload(typing.NamedTuple):
+    """A serialised payload along with its entity tag."""
+
+    payload: bytes
+    etag: str
+
+    @classmethod
+    def from_payload(cls, payload: bytes) -> 'CachedPayload':
+        """Create a new entry for the given payload.
+
+        The entity tag is derived from the payload's hash, so identical
+        payloads always share the same tag.
+        """
+        digest = hashlib.blake2b(payload, digest_size=16).hexdigest()
+        return cls(payload, f'"{digest}"')
+
+
+class PayloadCache:
+    """Cache of serialised response payloads.
+
+    Payloads are stored by key, which should be a hashable combination
+    of any endpoint parameters affecting the payload. Endpoints without
+    parameters can use the default key.
+
+    Entries expire after the number of seconds given via ``ttl``. If no
+    TTL is given, entries are kept until they are overwritten.
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        self._ttl = ttl
+        self._payloads: dict[
+            typing.Hashable, tuple[float, CachedPayload]] = {}
+
+    def get(self, key: typing.Hashable = None) -> CachedPayload | None:
+        """Return the cached payload for the given key, if any."""
+        try:
+            expires, cached = self._payloads[key]
+        except KeyError:
+            return None
+        if expires < time.monotonic():
+            del self._payloads[key]
+            return None
+        return cached
+
+    def set(self, payload: bytes,
+            key: typing.Hashable = None) -> CachedPayload:
+        """Store a payload in the cache and return its entry."""
+        cached = CachedPayload.from_payload(payload)
+        expires = (time.monotonic() + self._ttl
+                   if self._ttl is not None else float('inf'))
+        self._payloads[key] = expires, cached
+        return cached
+
+    def clear(self) -> None:
+        """Remove all cached payloads."""
+        self._payloads.clear()
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Check whether an entity tag matches an If-None-Match header."""
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        # If-None-Match uses weak comparison, so any W/ prefix is ignored
+        if tag == '*' or tag.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+def static_response(request: fastapi.Request,
+                    cached: CachedPayload) -> Response:
+    """Create a response for a static endpoint's payload.
+
+    The response carries the payload's entity tag and the cache
+    control header for static endpoints. If the client already holds
+    the current payload as indicated by its If-None-Match header, an
+    empty 304 Not Modified response is returned instead.
+    """
+    headers = {'Cache-Control': STATIC_CACHE_CONTROL, 'ETag': cached.etag}
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match is not None and _etag_matches(cached.etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+    return RawJSONResponse(cached.payload, headers=headers)
+
+
+async def cached_fetch(
+    request: fastapi.Request,
+    cache: PayloadCache,
+    key: typing.Hashable,
+    loader: typing.Callable[[], typing.Awaitable[list[typing.Any]]],
+) -> Response:
+    """Create a response for a static endpoint, loading it if needed.
+
+    Static endpoints serve data that only changes with game updates, so
+    their serialised payload is cached rather than re-queried for every
+    request. On a cache miss, the rows returned by ``loader`` are
+    serialised and stored under the given key.
+
+    Empty results are neither cached nor sent with caching headers, as
+    they may only be due to an unknown parameter or a database that has
+    not been populated yet. This also keeps arbitrary parameters from
+    growing the cache.
+    """
+    if (cached := cache.get(key)) is None:
+        rows = await loader()
+        if not rows:
+            return RawJSONResponse(
+                dumps(rows), headers={'Cache-Control': _NO_CACHE_CONTROL})
+        cached = cache.set(dumps(rows), key)
+    return static_response(request, cached)
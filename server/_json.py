@@ -0,0 +1,46 @@
+"""JSON serialisation helpers and response classes using orjson."""
+
+import decimal
+import typing
+
+import orjson
+from starlette.responses import JSONResponse, Response
+
+__all__ = [
+    'dumps',
+    'ORJSONResponse',
+    'RawJSONResponse',
+]
+
+
+def _default(obj: typing.Any) -> typing.Any:
+    """Fallback serialiser for types not natively supported by orjson."""
+    # NUMERIC columns are returned as Decimal by psycopg; database rows are
+    # serialised as-is, so these must be converted here.
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    raise TypeError
+
+
+def dumps(content: typing.Any) -> bytes:
+    """Serialise the given content to JSON."""
+    # UTC datetimes use the "Z" suffix, matching the previous serialisation
+    # via pydantic rather than orjson's default "+00:00" offset
+    return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered using orjson.
+
+    Equivalent to FastAPI's own ``ORJSONResponse``, which is deprecated
+    in recent FastAPI releases.
+    """
+
+    def render(self, content: typing.Any) -> bytes:
+        return dumps(content)
+
+
+class RawJSONResponse(Response):
+    """JSON response for payloads that have already been serialised."""
+
+    media_type = 'application/json'
@@ -7,14 +7,18 @@ None of the contents of this module are meant to be exported or used in
 other modules; this is the main client.
 """
 
+import contextlib
 import logging
+import typing
 
 import fastapi
 from fastapi.middleware.cors import CORSMiddleware
 
 from . import routes, __version__ as _version
+from ._json import ORJSONResponse
 from ._logging import ForwardHandler
 from ._static import StaticFilesApp
+from .database import Database
 
 # List of remote hosts for which CORS reponses headers should be included
 _ORIGINS = [
@@ -26,6 +30,24 @@ _api_log = logging.getLogger('api.server')
 _uvicorn_log = logging.getLogger('uvicorn')
 _uvicorn_log.handlers = [ForwardHandler(_api_log)]
 
+
+@contextlib.asynccontextmanager
+async def _lifespan(app_: fastapi.FastAPI) -> typing.AsyncIterator[None]:
+    """Open the database connection pool for the app's lifetime.
+
+    The pool is attached to the application state, from where it is
+    injected into the route handlers.
+    """
+    pool = Database().pool
+    await pool.open(wait=True)
+    app_.state.pool = pool
+    _api_log.info('Database connection pool opened')
+    try:
+        yield
+    finally:
+        await pool.close()
+
+
 # Create the API application
 app = fastapi.FastAPI(
     title='PS2 Map API',
@@ -34,7 +56,9 @@ app = fastapi.FastAPI(
     'For additional information, please refer to the project repository at '
     '<https://github.com/leonhard-s/ps2-map-api>.',
     docs_url=None,
-    redoc_url='/docs')
+    redoc_url='/docs',
+    default_response_class=ORJSONResponse,
+    lifespan=_lifespan)
 
 # Add CORS middleware to inject appropriate response headers
 app.add_middleware(
@@ -5,13 +5,13 @@ aliases any library-specific types, and defines the getter methods for
 accessing API data.
 """
 
+from ._fetch import fetch_all
 from ._pool_singleton import Connection, Cursor, Database, Pool
-from .factories import model_factory
 
 __all__ = [
     'Connection',
     'Cursor',
     'Database',
     'Pool',
-    'model_factory',
+    'fetch_all',
 ]
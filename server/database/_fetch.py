@@ -0,0 +1,31 @@
+"""Shorthand helpers for running the API's queries."""
+
+import typing
+
+from psycopg.rows import dict_row
+
+from ._pool_singleton import Pool
+
+__all__ = [
+    'fetch_all',
+]
+
+
+async def fetch_all(pool: Pool, query: bytes,
+                    params: typing.Sequence[typing.Any] = (),
+                    ) -> list[dict[str, typing.Any]]:
+    """Run a query and return all resulting rows.
+
+    Rows are returned as dictionaries keyed by column name, ready to be
+    serialised without any intermediate model objects.
+
+    Args:
+        pool: Connection pool to acquire the connection from.
+        query: The SQL query to execute.
+        params: Parameters to bind to the query's placeholders.
+
+    """
+    async with pool.connection() as conn:
+        async with conn.cursor(row_factory=dict_row) as cur:
+            await cur.execute(query, params)
+            return await cur.fetchall()
@@ -26,7 +26,7 @@ class Database:
     """
 
     __instance: 'Database | None' = None
-    _pool: Pool | None
+    _pool: Pool | None = None
 
     def __new__(cls) -> 'Database':
         if cls.__instance is None:
@@ -42,15 +42,22 @@ class Database:
 
     @classmethod
     def create_pool(cls, host: str, port: int, user: str, password: str,
-                    database: str) -> None:
+                    database: str, min_size: int = 10,
+                    max_size: int = 50) -> None:
         """Create a new connection pool to the database.
 
+        The pool is created closed and must be opened via its
+        :meth:`~psycopg_pool.AsyncConnectionPool.open` method before
+        use. This is handled by the application's lifespan hook.
+
         Args:
             host: Hostname of the database server.
             port: Port of the database server.
             user: Username to connect to the database.
             password: Password to connect to the database.
             database: Name of the database to connect to.
+            min_size: Number of connections to keep open at all times.
+            max_size: Maximum number of concurrent connections.
 
         """
         connection_string = (f'host={host} '
@@ -58,4 +65,8 @@ class Database:
                              f'user={user} '
                              f'password={password} '
                              f'dbname={database}')
-        cls._pool = psycopg_pool.AsyncConnectionPool(connection_string)
+        # The API only ever runs a handful of fixed queries; preparing them on
+        # first use lets the server reuse the query plan for every request.
+        cls._pool = psycopg_pool.AsyncConnectionPool(
+            connection_string, min_size=min_size, max_size=max_size,
+            max_idle=300, kwargs={'prepare_threshold': 0}, open=False)
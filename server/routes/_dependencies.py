@@ -0,0 +1,19 @@
+"""Shared dependencies for the API routes."""
+
+import fastapi
+
+from ..database import Pool
+
+__all__ = [
+    'get_pool',
+]
+
+
+async def get_pool(request: fastapi.Request) -> Pool:
+    """Return the database connection pool of the application.
+
+    The pool is opened and attached to the application state by the
+    app's lifespan hook.
+    """
+    pool: Pool = request.app.state.pool
+    return pool
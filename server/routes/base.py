@@ -1,69 +1,91 @@
 """API routes for map bases."""
 
+import typing
+
 import fastapi
 from fastapi.params import Query
+from starlette.responses import Response
 
-from ..database import Database, model_factory
+from .._cache import PayloadCache, STATIC_TTL, cached_fetch
+from .._json import ORJSONResponse
+from ..database import Pool, fetch_all
 from ..models import Base, BaseStatus
 from ..sql import GET_BASE_BY_CONTINENT, GET_BASE_STATUS
+from ._dependencies import get_pool
 
 router = fastapi.APIRouter(prefix='/base')
 
+# Query parameters of the endpoints in this module
+_CONTINENT_ID = Query(
+    ...,
+    title='Continent ID',
+    description='Unique ID of the continent for which to return base '
+    'information.')
+_STATUS_CONTINENT_ID = Query(
+    ...,
+    title='Continent ID',
+    description='Unique ID of the continent for which to return base '
+    'status information.')
+_SERVER_ID = Query(
+    ...,
+    title='Server ID',
+    description='Game server ID for which to return base status '
+    'information.')
+
+# Serialised static base payloads by continent ID
+_cache = PayloadCache(ttl=STATIC_TTL)
+
+# Mapping of in-game facility type IDs to base type codes
+_BASE_TYPE_CODES = {
+    2: 'amp-station',
+    3: 'bio-lab',
+    4: 'tech-plant',
+    5: 'large-outpost',
+    6: 'small-outpost',
+    7: 'warpgate',
+    8: 'interlink',
+    9: 'construction-outpost',
+    11: 'containment-site',
+    12: 'trident',
+    13: 'small-outpost',  # seapost
+    14: 'large-outpost',  # large CTF outpost
+    15: 'small-outpost',  # small CTF outpost
+    16: 'amp-station',  # Amp Station CTF
+}
+
+# Mapping of outfit resource IDs to resource codes
+_RESOURCE_CODES = {
+    1: 'auraxium',
+    2: 'synthium',
+    3: 'polystellarite',
+}
+
 
 def _code_from_base_id(type_id: int) -> str:
-    if type_id == 2:
-        return 'amp-station'
-    if type_id == 3:
-        return 'bio-lab'
-    if type_id == 4:
-        return 'tech-plant'
-    if type_id == 5:
-        return 'large-outpost'
-    if type_id == 6:
-        return 'small-outpost'
-    if type_id == 7:
-        return 'warpgate'
-    if type_id == 8:
-        return 'interlink'
-    if type_id == 9:
-        return 'construction-outpost'
-    if type_id == 11:
-        return 'containment-site'
-    if type_id == 12:
-        return 'trident'
-    if type_id == 13:
-        # seapost
-        return 'small-outpost'
-    if type_id == 14:
-        # large CTF outpost
-        return 'large-outpost'
-    if type_id == 15:
-        # small CTF outpost
-        return 'small-outpost'
-    if type_id == 16:
-        # Amp Station CTF
-        return 'amp-station'
-    return 'unknown'
+    return _BASE_TYPE_CODES.get(type_id, 'unknown')
 
 
 def _code_from_resource_id(resource_id: int) -> str:
-    if resource_id == 1:
-        return 'auraxium'
-    if resource_id == 2:
-        return 'synthium'
-    if resource_id == 3:
-        return 'polystellarite'
-    return 'unknown'
+    return _RESOURCE_CODES.get(resource_id, 'unknown')
 
 
-@router.get('', response_model=list[Base])
+async def _fetch_bases(pool: Pool,
+                       continent_id: int) -> list[dict[str, typing.Any]]:
+    bases = await fetch_all(pool, GET_BASE_BY_CONTINENT, (continent_id,))
+    # Rows are serialised as-is, only the type and resource IDs are replaced
+    # with their codes
+    for row in bases:
+        row['type_code'] = _code_from_base_id(row['type_code'])
+        row['resource_code'] = _code_from_resource_id(row['resource_code'])
+    return bases
+
+
+@router.get('', responses={200: {'model': list[Base]}})
 async def base(
-    continent_id: int = Query(  # type: ignore
-        ...,
-        title='Continent ID',
-        description='Unique ID of the continent for which to return base '
-        'information.'),
-) -> list[Base]:
+    request: fastapi.Request,
+    continent_id: int = _CONTINENT_ID,  # type: ignore
+    pool: Pool = fastapi.Depends(get_pool),
+) -> Response:
     """Static endpoint returning bases on a per-continent basis.
 
     This data only changes with major game updates such as continent
@@ -73,47 +95,20 @@ async def base(
     updating their cache intermittently to stay up-to-date with game
     updates, e.g. once per day/week.
     """
-    async with Database().pool.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(GET_BASE_BY_CONTINENT, (continent_id,))
-            bases = await cur.fetchall()
-    models: list[Base] = []
-    for base in bases:
-        base_patched = Base(
-            id=base[0],
-            continent_id=base[1],
-            name=base[2],
-            map_pos=[base[3], base[4]],
-            type_name=base[5],
-            type_code=_code_from_base_id(base[6]),
-            resource_capture_amount=base[7],
-            resource_control_amount=base[8],
-            resource_name=base[9],
-            resource_code=_code_from_resource_id(base[10]),
-        )
-        models.append(base_patched)
-    return models
-
-
-@router.get('/status', response_model=list[BaseStatus])
+    return await cached_fetch(
+        request, _cache, continent_id,
+        lambda: _fetch_bases(pool, continent_id))
+
+
+@router.get('/status', responses={200: {'model': list[BaseStatus]}})
 async def base_status(
-    continent_id: int = Query(  # type: ignore
-        ...,
-        title='Continent ID',
-        description='Unique ID of the continent for which to return base '
-        'status information.'),
-    server_id: int = Query(  # type: ignore
-        ...,
-        title='Server ID',
-        description='Game server ID for which to return base status '
-        'information.'),
-) -> list[BaseStatus]:
+    continent_id: int = _STATUS_CONTINENT_ID,  # type: ignore
+    server_id: int = _SERVER_ID,  # type: ignore
+    pool: Pool = fastapi.Depends(get_pool),
+) -> ORJSONResponse:
     """Dynamic endpoint returning base status information.
 
     This endpoint is updated close to real time as bases are captured.
     """
-    async with Database().pool.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(GET_BASE_STATUS, (continent_id, server_id))
-            bases = await cur.fetchall()
-    return [model_factory(BaseStatus, b) for b in bases]
+    bases = await fetch_all(pool, GET_BASE_STATUS, (continent_id, server_id))
+    return ORJSONResponse(bases)
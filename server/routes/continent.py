@@ -1,16 +1,25 @@
 """API routes for PS2 continents/zones."""
 
 import fastapi
+from starlette.responses import Response
 
-from ..database import Database, model_factory
+from .._cache import PayloadCache, STATIC_TTL, cached_fetch
+from ..database import Pool, fetch_all
 from ..models import Continent
 from ..sql import GET_CONTINENT_ALL_TRACKED
+from ._dependencies import get_pool
 
 router = fastapi.APIRouter(prefix='/continent')
 
+# Serialised continent payload
+_cache = PayloadCache(ttl=STATIC_TTL)
 
-@router.get('', response_model=list[Continent])
-async def continent() -> list[Continent]:
+
+@router.get('', responses={200: {'model': list[Continent]}})
+async def continent(
+    request: fastapi.Request,
+    pool: Pool = fastapi.Depends(get_pool),
+) -> Response:
     """Static endpoint returning all available continents.
 
     This endpoint returns all continents (aka. zones) in the database,
@@ -24,8 +33,6 @@ async def continent() -> list[Continent]:
     updating their cache intermittently to stay up-to-date with game
     updates, e.g. once per day/week.
     """
-    async with Database().pool.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(GET_CONTINENT_ALL_TRACKED)
-            bases = await cur.fetchall()
-    return [model_factory(Continent, b) for b in bases]
+    return await cached_fetch(
+        request, _cache, None,
+        lambda: fetch_all(pool, GET_CONTINENT_ALL_TRACKED))
@@ -2,22 +2,32 @@
 
 import fastapi
 from fastapi.params import Query
+from starlette.responses import Response
 
-from ..database import Database, model_factory
+from .._cache import PayloadCache, STATIC_TTL, cached_fetch
+from ..database import Pool, fetch_all
 from ..models import LatticeLink
 from ..sql import GET_LATTICE_BY_CONTINENT
+from ._dependencies import get_pool
 
 router = fastapi.APIRouter(prefix='/lattice')
 
+_CONTINENT_ID = Query(
+    ...,
+    title='Continent ID',
+    description='Unique ID of the continent for which to return the list '
+    'of lattice links.')
 
-@router.get('', response_model=list[LatticeLink])
+# Serialised lattice link payloads by continent ID
+_cache = PayloadCache(ttl=STATIC_TTL)
+
+
+@router.get('', responses={200: {'model': list[LatticeLink]}})
 async def lattice(
-    continent_id: int = Query(  # type: ignore
-        ...,
-        title='Continent ID',
-        description='Unique ID of the continent for which to return the list '
-        'of lattice links.'),
-) -> list[LatticeLink]:
+    request: fastapi.Request,
+    continent_id: int = _CONTINENT_ID,  # type: ignore
+    pool: Pool = fastapi.Depends(get_pool),
+) -> Response:
     """Static endpoint returning lattice links for a given continent.
 
     This endpoint returns pairs of bases that are connected by the game
@@ -33,8 +43,6 @@ async def lattice(
     updating their cache intermittently to stay up-to-date with game
     updates, e.g. once per day/week.
     """
-    async with Database().pool.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(GET_LATTICE_BY_CONTINENT, (continent_id,))
-            links = await cur.fetchall()
-    return [model_factory(LatticeLink, l) for l in links]
+    return await cached_fetch(
+        request, _cache, continent_id,
+        lambda: fetch_all(pool, GET_LATTICE_BY_CONTINENT, (continent_id,)))
@@ -1,23 +1,29 @@
 """API routes for PS2 game servers."""
 
 import fastapi
+from starlette.responses import Response
 
-from ..database import Database, model_factory
+from .._cache import PayloadCache, STATIC_TTL, cached_fetch
+from ..database import Pool, fetch_all
 from ..models import Server
 from ..sql import GET_SERVER_ALL_TRACKED
+from ._dependencies import get_pool
 
 router = fastapi.APIRouter(prefix='/server')
 
+# Serialised tracked server payload
+_cache = PayloadCache(ttl=STATIC_TTL)
 
-@router.get('', response_model=list[Server])
-async def server() -> list[Server]:
+
+@router.get('', responses={200: {'model': list[Server]}})
+async def server(
+    request: fastapi.Request,
+    pool: Pool = fastapi.Depends(get_pool),
+) -> Response:
     """Static endpoint returning all tracked servers.
 
     This endpoint only returns servers that are actively tracked by the
     map API and for which real-time map data is available.
     """
-    async with Database().pool.connection() as conn:
-        async with conn.cursor() as cur:
-            await cur.execute(GET_SERVER_ALL_TRACKED)
-            bases = await cur.fetchall()
-    return [model_factory(Server, b) for b in bases]
+    return await cached_fetch(
+        request, _cache, None, lambda: fetch_all(pool, GET_SERVER_ALL_TRACKED))
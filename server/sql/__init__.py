@@ -15,10 +15,13 @@ __all__ = [
 _SQL_DIR = pathlib.Path(__file__).parent
 
 
-def _get_sql(filename: str) -> str:
-    """Loads a file from disk and returns its contents."""
-    with open(_SQL_DIR / filename, encoding='utf-8') as sql_file:
-        return sql_file.read()
+def _get_sql(filename: str) -> bytes:
+    """Loads a file from disk and returns its contents.
+
+    The query is returned as UTF-8 encoded bytes, which psycopg accepts
+    as-is rather than re-encoding the query string for every execution.
+    """
+    return (_SQL_DIR / filename).read_bytes()
 
 
 GET_BASE_BY_CONTINENT = _get_sql('get_Base_byContinent.sql')
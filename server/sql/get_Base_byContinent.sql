@@ -3,8 +3,7 @@ SELECT
     "id",
     "continent_id",
     "name",
-    "map_pos_x",
-    "map_pos_y",
+    ARRAY["map_pos_x", "map_pos_y"]::float8[] AS "map_pos",
     "type_name",
     "type_code",
     "resource_capture_amount",
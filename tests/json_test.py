@@ -0,0 +1,30 @@
+"""Unit tests for the server's JSON serialisation helpers."""
+
+import datetime
+import decimal
+import unittest
+
+from server._json import dumps
+
+
+class DumpsTest(unittest.TestCase):
+    """Serialisation of database rows."""
+
+    def test_decimal(self) -> None:
+        """Test that Decimal values are serialised as numbers."""
+        for value, expected in ((decimal.Decimal('0.4'), b'0.4'),
+                                (decimal.Decimal('2'), b'2.0'),
+                                (decimal.Decimal('-130.9'), b'-130.9')):
+            with self.subTest(value=value):
+                self.assertEqual(dumps([value]), b'[' + expected + b']')
+
+    def test_utc_datetime(self) -> None:
+        """Test that UTC datetimes are serialised with a Z suffix."""
+        value = datetime.datetime(
+            2022, 5, 1, 12, 30, 15, tzinfo=datetime.timezone.utc)
+        self.assertEqual(dumps([value]), b'["2022-05-01T12:30:15Z"]')
+
+    def test_unknown_type(self) -> None:
+        """Test that unsupported types raise a TypeError."""
+        with self.assertRaises(TypeError):
+            dumps({'a': object()})
@@ -1,8 +1,16 @@
 """Unit tests for map tile extractor tests."""
 
+import pathlib
+import tempfile
 import unittest
 
+from PIL import Image
+
 from tools.map_tile_extractor import (  # pylint: disable=import-error
+    _collect_unpacked as collect_unpacked,  # type: ignore
+    _group_tiles as group_tiles,  # type: ignore
+    _merge_assets as merge_assets,  # type: ignore
+    _staging_dirs as staging_dirs,  # type: ignore
     _map_tile_count as map_tile_count,  # type: ignore
     _map_step_size as map_step_size,  # type: ignore
     _map_grid_limits as map_grid_limits  # type: ignore
@@ -82,3 +90,110 @@ class TileGridTests(unittest.TestCase):
             self.assertTupleEqual(map_grid_limits(1024, 1), (-8, 0))
             self.assertTupleEqual(map_grid_limits(1024, 2), (-8, -8))
             self.assertTupleEqual(map_grid_limits(1024, 3), (-8, -8))
+
+
+class UnpackTests(unittest.TestCase):
+    """Collection of assets unpacked from multiple archives."""
+
+    def test_collect_unpacked(self) -> None:
+        """Test that later archives win for duplicate asset names."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = pathlib.Path(temp_dir)
+            staging_dirs = [output / f'.unpack_{i}' for i in range(3)]
+            for index, staging_dir in enumerate(staging_dirs):
+                staging_dir.mkdir()
+                (staging_dir / 'shared.dds').write_bytes(bytes([index]))
+                (staging_dir / f'only_{index}.dds').write_bytes(b'')
+            collect_unpacked(staging_dirs, output)
+            self.assertEqual(
+                sorted(p.name for p in output.iterdir()),
+                ['only_0.dds', 'only_1.dds', 'only_2.dds', 'shared.dds'])
+            self.assertEqual((output / 'shared.dds').read_bytes(), b'\x02')
+
+    def test_staging_dirs_cleanup(self) -> None:
+        """Test that staging directories are removed after a failure."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = pathlib.Path(temp_dir)
+            with self.assertRaises(RuntimeError):
+                with staging_dirs(output, 2) as dirs:
+                    (dirs[0] / 'partial.dds').write_bytes(b'')
+                    raise RuntimeError('Unpacking failed')
+            self.assertEqual(list(output.iterdir()), [])
+
+    def test_staging_dirs_rerun(self) -> None:
+        """Test that leftovers from an interrupted run are not reused."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output = pathlib.Path(temp_dir)
+            leftover = output / '.unpack_0'
+            leftover.mkdir()
+            (leftover / 'stale.dds').write_bytes(b'')
+            with staging_dirs(output, 2) as dirs:
+                for staging_dir in dirs:
+                    self.assertTrue(staging_dir.is_dir())
+                    self.assertEqual(list(staging_dir.iterdir()), [])
+                (dirs[1] / 'tile.dds').write_bytes(b'')
+                collect_unpacked(dirs, output)
+            self.assertEqual(sorted(p.name for p in output.iterdir()),
+                             ['.unpack_0', 'tile.dds'])
+
+
+class GroupTests(unittest.TestCase):
+    """Grouping of unpacked tiles by map and LOD."""
+
+    def test_group_tiles(self) -> None:
+        """Test parsing of tile filenames, including underscored names."""
+        names = ['Amerish_Tile_000_004_LOD0.dds',
+                 'Amerish_Tile_-08_-04_LOD0.DDS',
+                 'Amerish_Tile_000_000_LOD1.dds',
+                 'Some_Map_Tile_-16_012_LOD2.dds',
+                 'Amerish_LOD0.dds',
+                 'readme.txt']
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = pathlib.Path(temp_dir)
+            for name in names:
+                (path / name).write_bytes(b'')
+            groups = group_tiles(path)
+        self.assertDictEqual(groups, {
+            ('Amerish', 0): {
+                (0, 4): path / 'Amerish_Tile_000_004_LOD0.dds',
+                (-8, -4): path / 'Amerish_Tile_-08_-04_LOD0.DDS'},
+            ('Amerish', 1): {
+                (0, 0): path / 'Amerish_Tile_000_000_LOD1.dds'},
+            ('Some_Map', 2): {
+                (-16, 12): path / 'Some_Map_Tile_-16_012_LOD2.dds'},
+        })
+
+
+class MergeTests(unittest.TestCase):
+    """Merging of map tiles into a single image."""
+
+    def test_merge_assets(self) -> None:
+        """Test tile placement and orientation in the merged image."""
+        # Map size 1024 at LOD 1 is a 2x2 grid of tiles. Each tile is stored
+        # mirrored vertically, so its top half ends up at the bottom.
+        colours = {
+            (-8, -8): ((255, 0, 0), (0, 255, 0)),
+            (0, -8): ((0, 0, 255), (255, 255, 0)),
+            (-8, 0): ((255, 0, 255), (0, 255, 255)),
+            (0, 0): ((255, 255, 255), (128, 128, 128)),
+        }
+        with tempfile.TemporaryDirectory() as temp_dir:
+            tiles: dict[tuple[int, int], pathlib.Path] = {}
+            for (tile_x, tile_y), (top, bottom) in colours.items():
+                tile = Image.new('RGB', (256, 256), bottom)
+                tile.paste(top, (0, 0, 256, 128))
+                path = pathlib.Path(temp_dir) / f'{tile_x}_{tile_y}.png'
+                tile.save(path)
+                tiles[tile_x, tile_y] = path
+            merged = merge_assets(1024, 1, tiles)
+        self.assertEqual(merged.size, (512, 512))
+        # Lower grid rows are placed at the bottom of the merged image
+        offsets = {(-8, 0): (0, 0), (0, 0): (256, 0),
+                   (-8, -8): (0, 256), (0, -8): (256, 256)}
+        for coords, (off_x, off_y) in offsets.items():
+            top, bottom = colours[coords]
+            with self.subTest(tile=coords):
+                self.assertEqual(
+                    merged.getpixel((off_x + 128, off_y + 64)), bottom)
+                self.assertEqual(
+                    merged.getpixel((off_x + 128, off_y + 192)), top)
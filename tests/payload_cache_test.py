@@ -0,0 +1,110 @@
+"""Unit tests for the server's payload cache."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+import fastapi
+
+from server._cache import (CachedPayload, PayloadCache, cached_fetch,
+                           static_response)
+
+
+class PayloadCacheTest(unittest.TestCase):
+    """Payload storage and expiry."""
+
+    def test_get_set(self) -> None:
+        """Test storing and retrieving payloads by key."""
+        cache = PayloadCache()
+        self.assertIsNone(cache.get())
+        self.assertEqual(cache.set(b'[]').payload, b'[]')
+        self.assertEqual(cache.get(), CachedPayload.from_payload(b'[]'))
+        cache.set(b'[1]', 2)
+        self.assertEqual(cache.get(2), CachedPayload.from_payload(b'[1]'))
+        self.assertIsNone(cache.get(4))
+        cache.clear()
+        self.assertIsNone(cache.get())
+        self.assertIsNone(cache.get(2))
+
+    def test_expiry(self) -> None:
+        """Test that payloads expire after their TTL."""
+        cache = PayloadCache(ttl=10.0)
+        with mock.patch('time.monotonic', return_value=100.0):
+            cache.set(b'[]')
+        with mock.patch('time.monotonic', return_value=109.0):
+            self.assertIsNotNone(cache.get())
+        with mock.patch('time.monotonic', return_value=111.0):
+            self.assertIsNone(cache.get())
+
+
+def _request(if_none_match: str | None = None) -> fastapi.Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b'if-none-match', if_none_match.encode()))
+    return fastapi.Request({'type': 'http', 'headers': headers})
+
+
+class StaticResponseTest(unittest.TestCase):
+    """Entity tags and conditional requests for static endpoints."""
+
+    def test_etag(self) -> None:
+        """Test that entity tags only depend on the payload."""
+        cached = CachedPayload.from_payload(b'[]')
+        self.assertEqual(cached, CachedPayload.from_payload(b'[]'))
+        self.assertNotEqual(
+            cached.etag, CachedPayload.from_payload(b'[1]').etag)
+        self.assertTrue(cached.etag.startswith('"'))
+        self.assertTrue(cached.etag.endswith('"'))
+
+    def test_response(self) -> None:
+        """Test full responses for unconditional or stale requests."""
+        cached = CachedPayload.from_payload(b'[]')
+        for header in (None, '"abc"', 'W/"abc", "def"'):
+            with self.subTest(if_none_match=header):
+                response = static_response(_request(header), cached)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.body, b'[]')
+                self.assertEqual(response.headers['etag'], cached.etag)
+
+    def test_not_modified(self) -> None:
+        """Test empty 304 responses for matching entity tags."""
+        cached = CachedPayload.from_payload(b'[]')
+        for header in (cached.etag, f'W/{cached.etag}',
+                       f'"abc", {cached.etag}', '*'):
+            with self.subTest(if_none_match=header):
+                response = static_response(_request(header), cached)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.body, b'')
+                self.assertEqual(response.headers['etag'], cached.etag)
+
+
+class CachedFetchTest(unittest.TestCase):
+    """Loading and caching of static endpoint payloads."""
+
+    def test_cached(self) -> None:
+        """Test that payloads are loaded once and then served cached."""
+        cache = PayloadCache()
+        loader = mock.AsyncMock(return_value=[{'id': 1}])
+        for _ in range(2):
+            response = asyncio.run(
+                cached_fetch(_request(), cache, 4, loader))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.body, b'[{"id":1}]')
+            self.assertIn('etag', response.headers)
+        loader.assert_awaited_once()
+        self.assertIsNotNone(cache.get(4))
+
+
+    def test_empty(self) -> None:
+        """Test that empty results are neither cached nor cacheable."""
+        cache = PayloadCache()
+        loader = mock.AsyncMock(return_value=[])
+        for _ in range(2):
+            response = asyncio.run(
+                cached_fetch(_request(), cache, 4, loader))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.body, b'[]')
+            self.assertEqual(response.headers['cache-control'], 'no-cache')
+            self.assertNotIn('etag', response.headers)
+        self.assertEqual(loader.await_count, 2)
+        self.assertIsNone(cache.get(4))
@@ -0,0 +1,104 @@
+"""Unit tests for the exported API routers."""
+
+import asyncio
+import contextlib
+import decimal
+import json
+import pathlib
+import subprocess
+import sys
+import typing
+import unittest
+
+import fastapi
+
+from server.routes.base import (  # type: ignore
+    _cache as base_cache, base as base_endpoint)
+
+# Repository root, from which the server package is importable
+_REPO_ROOT = pathlib.Path(__file__).resolve().parent.parent
+
+# Imports a route submodule before the package exports are accessed, then
+# checks that every exported name is still a router rather than the module.
+_IMPORT_ORDER_SCRIPT = '''
+import fastapi
+import server.routes.continent
+from server import routes
+for name in routes.__all__:
+    assert isinstance(getattr(routes, name), fastapi.APIRouter), name
+'''
+
+
+class _FakeCursor:
+    """Cursor stand-in returning a fixed set of rows."""
+
+    def __init__(self, rows: list[dict[str, typing.Any]]) -> None:
+        self._rows = rows
+
+    async def execute(self, *_: typing.Any) -> None:
+        """Ignore the query; the rows are fixed."""
+
+    async def fetchall(self) -> list[dict[str, typing.Any]]:
+        """Return copies of the fixed rows."""
+        return [dict(row) for row in self._rows]
+
+
+class _FakePool:
+    """Connection pool stand-in whose cursors return fixed rows."""
+
+    def __init__(self, rows: list[dict[str, typing.Any]]) -> None:
+        self._rows = rows
+
+    @contextlib.asynccontextmanager
+    async def connection(self) -> typing.AsyncIterator['_FakePool']:
+        """Yield the pool itself as the connection."""
+        yield self
+
+    @contextlib.asynccontextmanager
+    async def cursor(self, **_: typing.Any
+                     ) -> typing.AsyncIterator[_FakeCursor]:
+        """Yield a cursor over the fixed rows."""
+        yield _FakeCursor(self._rows)
+
+
+class RouterExportTest(unittest.TestCase):
+    """Router exports of the routes package."""
+
+    def test_submodule_import_order(self) -> None:
+        """Test that importing a submodule first keeps the exports intact."""
+        result = subprocess.run(
+            [sys.executable, '-c', _IMPORT_ORDER_SCRIPT],
+            capture_output=True, text=True, check=False, cwd=_REPO_ROOT)
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+class BaseRouteTest(unittest.TestCase):
+    """Row shaping of the static base endpoint."""
+
+    def setUp(self) -> None:
+        base_cache.clear()
+
+    def tearDown(self) -> None:
+        base_cache.clear()
+
+    def test_codes(self) -> None:
+        """Test that type and resource IDs are replaced with codes."""
+        cases = ((5, 3, 'large-outpost', 'polystellarite'),
+                 (13, None, 'small-outpost', 'unknown'),
+                 (7, None, 'warpgate', 'unknown'),
+                 (999, 1, 'unknown', 'auraxium'))
+        for type_id, resource_id, type_code, resource_code in cases:
+            with self.subTest(type_id=type_id, resource_id=resource_id):
+                base_cache.clear()
+                row = {'id': 1, 'map_pos': [1.5, -2.0],
+                       'type_code': type_id, 'resource_code': resource_id,
+                       'resource_capture_amount': decimal.Decimal('0.4')}
+                request = fastapi.Request({'type': 'http', 'headers': []})
+                response = asyncio.run(base_endpoint(
+                    request, continent_id=2,
+                    pool=_FakePool([row])))  # type: ignore
+                data = json.loads(response.body)
+                self.assertEqual(data, [{
+                    'id': 1, 'map_pos': [1.5, -2.0],
+                    'type_code': type_code, 'resource_code': resource_code,
+                    'resource_capture_amount': 0.4}])
@@ -28,13 +28,17 @@ own risk.
 # <https://github.com/RhettVX/forgelight-toolbox>
 
 import argparse
+import collections
+import concurrent.futures
+import contextlib
 import math
 import os
 import pathlib
 import re
+import shutil
 import sys
 import tempfile
-from typing import Iterable, Iterator, Sized
+from typing import Callable, Iterable, Iterator, Sized
 
 from DbgPack import AssetManager  # type: ignore
 from PIL import Image
@@ -42,7 +46,18 @@ from PIL import Image
 # Regular expression used to select the files to scrape for map tiles
 FILE_SCRAPE_REGEX = r'(data_x64_\d+.pack2)'
 # Regular expression used to identify map tile assets
-TILE_ASSET_REGEX = r'(\w+_Tile(_[\d-]\d\d){2}_LOD\d\.((dds)|(DDS)))'
+TILE_ASSET_REGEX = r'\w+_Tile(?:_[\d-]\d\d){2}_LOD\d\.(?:dds|DDS)'
+
+# Compiled versions of the above. Asset data is scanned as bytes
+_FILE_SCRAPE_PATTERN = re.compile(FILE_SCRAPE_REGEX)
+_TILE_ASSET_PATTERN = re.compile(TILE_ASSET_REGEX.encode('utf-8'))
+# Pattern used to parse the tile properties from an extracted asset's name
+_TILE_FILENAME_PATTERN = re.compile(
+    r'(?P<name>\w+)_Tile_(?P<x>[\d-]\d\d)_(?P<y>[\d-]\d\d)_LOD(?P<lod>\d)\.')
+# Literal substring of any tile asset name. Substring search is much faster
+# than the regex, so it is used to skip assets that cannot contain matches.
+# This must be kept in sync with TILE_ASSET_REGEX.
+_TILE_ASSET_MARKER = b'_Tile_'
 
 # Files matching these prefixes will not be considered when unpacking
 # map assets.
@@ -60,6 +75,16 @@ PS2_INSTALL_DIRECTORIES = [
 # Name of the PS2 executable, used to confirm installation folders
 PS2_EXCUTABLE_NAME = 'PlanetSide2_x64.exe'
 
+# Number of writer threads per archive being unpacked. Archives are unpacked
+# by one worker process per CPU core, all of which write to the same disk, so
+# this is kept small.
+UNPACK_WRITER_THREADS = 2
+# Maximum number of extracted assets per archive waiting to be written to disk
+UNPACK_MAX_PENDING_WRITES = 8
+
+# Number of tiles sent to a worker process at a time when converting
+CONVERT_CHUNK_SIZE = 16
+
 # Base size of in-game map tiles
 PS2_TILE_SIZE = 256
 
@@ -81,19 +106,6 @@ def _bytes_to_string(bytes_: bytes) -> str:
     return bytes_.decode('utf-8')
 
 
-def _str_to_bytes(string: str) -> bytes:
-    """Convert a native string to a UTF-8 encoded bytes object.
-
-    Args:
-        string (str): String to convert
-
-    Returns:
-        bytes: UTF-8 encoded bytes object
-
-    """
-    return bytes(string, 'utf-8')
-
-
 def _find_game_folder(dir_: pathlib.Path | None = None) -> pathlib.Path:
     """Locate the PlanetSide 2 installation directory.
 
@@ -147,18 +159,18 @@ def _get_tile_namelist(paths: Iterable[pathlib.Path]) -> list[str]:
         list[str]: A list of filenames matching the map tile format
 
     """
-    tile_asset_pattern = re.compile(_str_to_bytes(TILE_ASSET_REGEX))
-    namelist: set[str] = set()
+    # Names are collected as bytes and only decoded once deduplicated
+    namelist: set[bytes] = set()
     # Process asset definitions
     manager = AssetManager(list(paths))
     for asset in manager:
         asset_data: bytes = asset.get_data(raw=False)  # type: ignore
+        if _TILE_ASSET_MARKER not in asset_data:
+            continue
         # Filter for file names looking like map tiles
-        matches = tile_asset_pattern.findall(asset_data)
-        for match in matches:
-            filename = match[0]
-            namelist.add(_bytes_to_string(filename))
-    return sorted(namelist)
+        namelist.update(
+            m.group() for m in _TILE_ASSET_PATTERN.finditer(asset_data))
+    return sorted(_bytes_to_string(n) for n in namelist)
 
 
 def _map_step_size(map_size: int, lod: int) -> int:
@@ -223,22 +235,45 @@ def _iter_map_grid(map_size: int, lod: int
             yield start_x, start_y
 
 
+def _load_tile(path: pathlib.Path) -> Image.Image:
+    """Load a map tile and undo its vertical mirroring.
+
+    The tile file is closed before returning, and the unflipped source
+    image is released as soon as this function returns.
+
+    Args:
+        path (pathlib.Path): Path of the tile to load
+
+    Returns:
+        Image.Image: The flipped map tile
+
+    """
+    with Image.open(path) as tile:
+        return tile.transpose(Image.FLIP_TOP_BOTTOM)
+
+
 def _merge_assets(map_size: int, lod: int, tiles: _TileMap) -> Image.Image:
-    """Create a single, merged image asset from the given tiles."""
+    """Create a single, merged image asset from the given tiles.
+
+    The map tiles are stored mirrored vertically. Rather than flipping
+    the merged image, each tile is flipped and the grid rows are placed
+    bottom to top, which avoids a second full-size image buffer.
+    """
     num_tiles = _map_tile_count(map_size, lod)
     merged_size = int(math.sqrt(num_tiles) * PS2_TILE_SIZE)
     # Create a pixel buffer for the full map image
     merged = Image.new('RGB', (merged_size, merged_size))
     # Place the individual map tiles in the buffer
     _, max_x = _map_grid_limits(map_size, lod)
-    cur_x = cur_y = 0
+    cur_x = 0
+    cur_y = merged_size - PS2_TILE_SIZE
     for tile_x, tile_y in _iter_map_grid(map_size, lod):
-        img_tile = Image.open(tiles[(tile_x, tile_y)])
+        img_tile = _load_tile(tiles[(tile_x, tile_y)])
         merged.paste(img_tile, (cur_x, cur_y))
         cur_x += PS2_TILE_SIZE
         # Jump to next grid row
         if tile_x == max_x:
-            cur_y += PS2_TILE_SIZE
+            cur_y -= PS2_TILE_SIZE
             cur_x = 0
     return merged
 
@@ -256,20 +291,18 @@ def _group_tiles(path: pathlib.Path) -> _LodTileMap:
 
     """
     print(' >> Grouping map tiles...')
-    lod_tiles: _LodTileMap = {}
-    for filename in os.listdir(path):
+    lod_tiles: _LodTileMap = collections.defaultdict(dict)
+    for entry in os.scandir(path):
         # Extract tile properties from the asset filename
-        chunks = filename.rsplit('.', maxsplit=1)[0].split('_')
-        name = chunks[0]
-        tile_x, tile_y = int(chunks[2]), int(chunks[3])
-        lod = int(chunks[4][-1])
-        # Get the tile mapping to store the tile in
-        tile_map: _TileMap = lod_tiles.get((name, lod), {})
-        if not tile_map:
-            lod_tiles[(name, lod)] = tile_map
+        match = _TILE_FILENAME_PATTERN.match(entry.name)
+        if match is None:
+            continue
+        name = match['name']
+        tile_x, tile_y = int(match['x']), int(match['y'])
+        lod = int(match['lod'])
         # Add the tile
-        tile_map[tile_x, tile_y] = path / filename
-    return lod_tiles
+        lod_tiles[name, lod][tile_x, tile_y] = pathlib.Path(entry.path)
+    return dict(lod_tiles)
 
 
 def _map_size(tiles: Sized) -> int:
@@ -296,7 +329,10 @@ def _map_tile_count(map_size: int, lod: int) -> int:
         int: The number of tiles in the given map's tile grid
 
     """
-    return math.ceil(4 ** (int(math.log2(map_size)) - 8 - lod))
+    # map_size.bit_length() - 1 is floor(log2(map_size)), computed without
+    # going through floating point; negative shifts mean a single tile
+    shift = 2 * (map_size.bit_length() - 9 - lod)
+    return 1 << shift if shift >= 0 else 1
 
 
 def _unpack_files(manager: AssetManager, output_dir: pathlib.Path) -> None:
@@ -306,6 +342,10 @@ def _unpack_files(manager: AssetManager, output_dir: pathlib.Path) -> None:
     asset manager. Any files not listed in the namelist are ignored and
     will not be exported.
 
+    Assets are decompressed on the calling thread while the files are
+    written by a thread pool, so disk writes do not block decoding of
+    the next asset.
+
     Args:
         manager (DbgPack.AssetManager): DbgPack asset manager used to
             navigate the archive
@@ -313,50 +353,162 @@ def _unpack_files(manager: AssetManager, output_dir: pathlib.Path) -> None:
             extracted files to
 
     """
-    for asset in manager.assets.values():
-        if not asset.name:
-            continue
-        # Extract asset to output directory
-        asset_data: bytes = asset.get_data(raw=False)  # type: ignore
-        (output_dir / asset.name).write_bytes(asset_data)
+    pending: set[concurrent.futures.Future[int]] = set()
+    with concurrent.futures.ThreadPoolExecutor(
+            max_workers=UNPACK_WRITER_THREADS) as executor:
+        for asset in manager.assets.values():
+            if not asset.name:
+                continue
+            # Limit the number of assets held in memory awaiting their write
+            if len(pending) >= UNPACK_MAX_PENDING_WRITES:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            # Extract asset to output directory
+            asset_data: bytes = asset.get_data(raw=False)  # type: ignore
+            pending.add(executor.submit(
+                (output_dir / asset.name).write_bytes, asset_data))
+        for future in concurrent.futures.as_completed(pending):
+            future.result()
+
+
+def _unpack_archive(archive: pathlib.Path, namelist: list[str],
+                    output_dir: pathlib.Path) -> None:
+    """Unpack the assets in the namelist from a single archive.
+
+    This is a module-level function so it can be run in a worker
+    process, with each worker unpacking one archive at a time.
+
+    Args:
+        archive (pathlib.Path): The *.pack2 archive to unpack
+        namelist (list[str]): Names of the assets to unpack
+        output_dir (pathlib.Path): Output directory to write the
+            extracted files to
+
+    """
+    manager = AssetManager([archive], namelist=namelist)
+    _unpack_files(manager, output_dir)
 
 
-def _process_raw(temp_path: pathlib.Path, out_path: pathlib.Path) -> None:
-    """Script handler for "raw" format.
+@contextlib.contextmanager
+def _staging_dirs(output_dir: pathlib.Path,
+                  count: int) -> Iterator[list[pathlib.Path]]:
+    """Create per-archive staging directories for unpacking.
 
-    This simply copies all extracted DDS assets to the target
-    directory.
+    The staging directories share a uniquely named parent directory
+    within the given output directory, so the unpacked files can be
+    renamed into place without crossing file systems. The parent
+    directory and anything left in it are removed on exit, including
+    when unpacking fails or is interrupted.
 
     Args:
-        temp_path (pathlib.Path): Directory containing the exported DDS
-            assets
-        out_path (pathlib.Path): Output directory
+        output_dir (pathlib.Path): Directory the assets will be
+            collected into
+        count (int): Number of staging directories to create
+
+    Yields:
+        list[pathlib.Path]: The staging directories
+
+    """
+    staging_root = pathlib.Path(
+        tempfile.mkdtemp(prefix='.unpack_', dir=output_dir))
+    try:
+        staging_dirs = [staging_root / str(index) for index in range(count)]
+        for staging_dir in staging_dirs:
+            staging_dir.mkdir()
+        yield staging_dirs
+    finally:
+        shutil.rmtree(staging_root, ignore_errors=True)
+
+
+def _collect_unpacked(staging_dirs: Iterable[pathlib.Path],
+                      output_dir: pathlib.Path) -> None:
+    """Move unpacked assets from their staging directories into place.
+
+    Every archive is unpacked into its own staging directory so that
+    parallel workers never write to the same file. The directories are
+    processed in archive order, so if multiple archives contain the
+    same asset, the copy from the last archive wins.
+
+    Args:
+        staging_dirs (Iterable[pathlib.Path]): Per-archive staging
+            directories, in archive order
+        output_dir (pathlib.Path): Directory to move the assets to
+
+    """
+    for staging_dir in staging_dirs:
+        for entry in os.scandir(staging_dir):
+            os.replace(entry.path, output_dir / entry.name)
+        staging_dir.rmdir()
+
+
+def _convert_tile(source: pathlib.Path, target: pathlib.Path) -> None:
+    """Flip a single DDS tile and save it in PNG format."""
+    img = _load_tile(source)
+    # The lowest compression level is several times faster than the default
+    # while producing barely larger files for these tiles
+    img.save(target, compress_level=1)
+
+
+def _convert_tile_webp(source: pathlib.Path, target: pathlib.Path) -> None:
+    """Flip a single DDS tile and save it in lossless WebP format."""
+    img = _load_tile(source)
+    # Method 0 is the fastest encoder setting, lossless output is unaffected
+    img.save(target, lossless=True, method=0)
+
+
+def _convert_tile_web(source: pathlib.Path, target: pathlib.Path) -> None:
+    """Flip a single DDS tile and save it in JPEG format."""
+    img = _load_tile(source).convert('RGB')
+    img.save(target, quality=80, subsampling=0)
+
+
+def _convert_files(converter: Callable[[pathlib.Path, pathlib.Path], None],
+                   files: list[tuple[pathlib.Path, pathlib.Path]]) -> None:
+    """Run a tile converter for the given files in worker processes.
+
+    Args:
+        converter (Callable[[pathlib.Path, pathlib.Path], None]):
+            Module-level function converting a single tile
+        files (list[tuple[pathlib.Path, pathlib.Path]]): Pairs of
+            source and target paths to convert
 
     """
-    for filename in os.listdir(temp_path):
-        os.rename(temp_path / filename, out_path / filename)
+    total = len(files)
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        # Tiles are sent to the workers in chunks to reduce IPC overhead
+        results = executor.map(
+            converter, [s for s, _ in files], [t for _, t in files],
+            chunksize=CONVERT_CHUNK_SIZE)
+        for index, _ in enumerate(results):
+            print(f' >> Converted file {index+1} of {total}')
 
 
-def _process_convert(temp_path: pathlib.Path, out_path: pathlib.Path) -> None:
+def _process_convert(temp_path: pathlib.Path, out_path: pathlib.Path,
+                     webp: bool = False) -> None:
     """Script handler for "convert" format.
 
     This reads all extracted DDS assets, flips them, and exports them
-    to the target directory in PNG format.
+    to the target directory in PNG format, or lossless WebP format if
+    requested.
 
     Args:
         temp_path (pathlib.Path): Directory containing the exported DDS
             assets
         out_path (pathlib.Path): Output directory
+        webp (bool): Whether to export lossless WebP instead of PNG
 
     """
-    files = os.listdir(temp_path)
-    total = len(files)
-    for index, filename in enumerate(files):
-        print(f' >> Converting file {index+1} of {total}')
-        outname = filename.rsplit('.', maxsplit=1)[0] + '.png'
-        img = Image.open(temp_path / filename)
-        img = img.transpose(Image.FLIP_TOP_BOTTOM)
-        img.save(out_path / outname)
+    if webp:
+        suffix, converter = '.webp', _convert_tile_webp
+    else:
+        suffix, converter = '.png', _convert_tile
+    files: list[tuple[pathlib.Path, pathlib.Path]] = []
+    for entry in os.scandir(temp_path):
+        outname = entry.name.rsplit('.', maxsplit=1)[0] + suffix
+        files.append((pathlib.Path(entry.path), out_path / outname))
+    _convert_files(converter, files)
 
 
 def _process_convert_web(temp_path: pathlib.Path, out_path: pathlib.Path) -> None:
@@ -371,15 +523,11 @@ def _process_convert_web(temp_path: pathlib.Path, out_path: pathlib.Path) -> Non
         out_path (pathlib.Path): Output directory
 
     """
-    files = os.listdir(temp_path)
-    total = len(files)
-    for index, filename in enumerate(files):
-        print(f' >> Converting file {index+1} of {total}')
-        outname = (filename.rsplit('.', maxsplit=1)[0] + '.jpeg').lower()
-        img = Image.open(temp_path / filename)
-        img = img.transpose(Image.FLIP_TOP_BOTTOM)
-        img = img.convert('RGB')
-        img.save(out_path / outname, quality=80, subsampling=0)
+    files: list[tuple[pathlib.Path, pathlib.Path]] = []
+    for entry in os.scandir(temp_path):
+        outname = (entry.name.rsplit('.', maxsplit=1)[0] + '.jpeg').lower()
+        files.append((pathlib.Path(entry.path), out_path / outname))
+    _convert_files(_convert_tile_web, files)
 
 
 def _process_merge(temp_path: pathlib.Path, out_path: pathlib.Path) -> None:
@@ -406,14 +554,12 @@ def _process_merge(temp_path: pathlib.Path, out_path: pathlib.Path) -> None:
         print(f' >> Merging map tiles for "{map_name}" (LOD {lod})')
         map_size = base_sizes[map_name]
         img_merged = _merge_assets(map_size, lod, tiles)
-        # Un-mirror the merged image
-        img_merged = img_merged.transpose(Image.FLIP_TOP_BOTTOM)
         filename = f'{map_name}_LOD{lod}.png'
         img_merged.save(out_path / filename)
 
 
 def main(format_: str, dir_: pathlib.Path | None,
-         output: pathlib.Path, namelist: bool) -> None:
+         output: pathlib.Path, namelist: bool, webp: bool = False) -> None:
     """Main script for tile extraction."""
     # Create the output directory if it does not exist yet
     if not output.exists():
@@ -432,12 +578,13 @@ def main(format_: str, dir_: pathlib.Path | None,
         raise NotADirectoryError(
             f'Game assets not found (expected at: {asset_dir})')
     print(f' >> Using game assets at "{asset_dir}"')
+    # The asset directory is listed once for both scraping and unpacking
+    asset_files = [e.name for e in os.scandir(asset_dir) if e.is_file()]
 
     # Scrape any *.pack2 data archives for matching assets
     print('\nGenerating namelist...')
-    file_regex_pattern = re.compile(FILE_SCRAPE_REGEX)
-    data_files = [asset_dir / f for f in os.listdir(asset_dir)
-                  if file_regex_pattern.fullmatch(f)]
+    data_files = [asset_dir / f for f in asset_files
+                  if _FILE_SCRAPE_PATTERN.fullmatch(f)]
     print(f' >> Scraping {len(data_files)} archive/s for matching names...')
     names = _get_tile_namelist(data_files)
     print(f' >> done\n >> {len(names)} matching assets found')
@@ -445,37 +592,49 @@ def main(format_: str, dir_: pathlib.Path | None,
         print('Unable to extract files due to empty namelist')
         sys.exit(1)
     if namelist:
-        with open(output / 'namelist.txt', 'w', encoding='utf-8') as file_:
-            file_.writelines((f'{s}\n' for s in names))
+        (output / 'namelist.txt').write_text(
+            '\n'.join(names) + '\n', encoding='utf-8')
 
     # Unpack all assets in a temporary directory
     print('\nExtracting assets...')
     with tempfile.TemporaryDirectory() as temp_dir:
         temp_path = pathlib.Path(temp_dir)
-        archives = [pathlib.Path(f) for f in os.listdir(asset_dir)
+        # Raw assets need no further processing and are unpacked directly
+        # into the output directory
+        unpack_path = output if format_ == 'raw' else temp_path
+        archives = [pathlib.Path(f) for f in asset_files
                     if f.endswith('.pack2')
                     and not f.startswith(FILE_UNPACK_BLACKLIST)]
         total = len(archives)
         ignored = [f'{f}*' for f in FILE_UNPACK_BLACKLIST]
         print(f' >> Ignored archives matching: {", ".join(ignored)}\n'
               f' >> Selected {total} archives\n')
-        for index, archive in enumerate(archives):
-            print(f' >> Extracting archive {index+1} of {total}: {archive}')
-            manager = AssetManager([asset_dir / archive], namelist=names)
-            _unpack_files(manager, temp_path)
+        # Archives are unpacked in parallel, each into its own staging
+        # directory next to the final location so the files can be renamed
+        with _staging_dirs(unpack_path, total) as staging_dirs:
+            with concurrent.futures.ProcessPoolExecutor() as executor:
+                futures = {
+                    executor.submit(_unpack_archive, asset_dir / archive,
+                                    names, staging_dir): archive
+                    for archive, staging_dir in zip(archives, staging_dirs)}
+                completed = concurrent.futures.as_completed(futures)
+                for index, future in enumerate(completed):
+                    future.result()
+                    print(f' >> Extracted archive {index+1} of {total}: '
+                          f'{futures[future]}')
+            _collect_unpacked(staging_dirs, unpack_path)
 
         print(f'\n >> Processing files using format "{format_}"...')
 
-        # Recombine the small assets into larger blocks
-        if format_ == 'raw':
-            _process_raw(temp_path, output)
-        elif format_ == 'convert':
-            _process_convert(temp_path, output)
+        # Recombine the small assets into larger blocks; raw assets were
+        # unpacked directly into the output directory and are left as-is
+        if format_ == 'convert':
+            _process_convert(temp_path, output, webp)
         elif format_ == 'convert_web':
             _process_convert_web(temp_path, output)
         elif format_ == 'merge':
             _process_merge(temp_path, output)
-        else:
+        elif format_ != 'raw':
             raise RuntimeError(f'Unhandled format: {format_}')
 
         print('\ndone\n')
@@ -504,6 +663,12 @@ if __name__ == '__main__':
     parser.add_argument(
         '--namelist', '-n', action='store_true',
         help='If set, the full namelist will be exported.')
+    parser.add_argument(
+        '--webp', action='store_true',
+        help='If set, tiles are exported as lossless WebP images '
+        'instead of PNGs. Only supported by the convert format.')
     kwargs = vars(parser.parse_args())
+    if kwargs['webp'] and kwargs['format_'] != 'convert':
+        parser.error('--webp is only supported by the convert format')
 
     main(**kwargs)